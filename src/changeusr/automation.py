@@ -1,21 +1,79 @@
 """Automation worker for changing GitHub usernames.
 
-This module exposes :class:`AutomationWorker`, a :class:`~PyQt5.QtCore.QObject`
-subclass used by the GUI to run the Playwright automation logic in a
-background thread.
+This module exposes :class:`AutomationWorker`, a :class:`~PyQt5.QtCore.QRunnable`
+used by the GUI to run the Playwright automation logic for one account on a
+:class:`~PyQt5.QtCore.QThreadPool`. All workers of a batch share a single
+:class:`BrowserSession` (one GoLogin profile, one Chromium) and each runs its
+:class:`AccountJob` in its own browser context.
 """
 
 from __future__ import annotations
 
-import json
+import functools
+import os
 import random
+import re
+import sys
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import contextmanager
 from dataclasses import dataclass
 from json.decoder import JSONDecodeError
-
-from PyQt5.QtCore import QObject, pyqtSignal
-from playwright.sync_api import Locator, Page, TimeoutError
-from gologin import GoLogin
+from pathlib import Path
+from typing import TYPE_CHECKING, Callable, Iterator
+from urllib.parse import urlsplit
+
+import orjson
+import pyotp
+from PyQt5.QtCore import QMutex, QObject, QRunnable, pyqtSignal
+
+if TYPE_CHECKING:
+    from gologin import GoLogin
+    from playwright.sync_api import Browser, BrowserContext, Locator, Page, Response, Route
+
+MAX_CONCURRENT_JOBS = 4
+
+_STATE_DIR = Path.home() / ".changeusr" / "state"
+_SETTINGS_ADMIN_URL = "https://github.com/settings/admin"
+# Routes are only registered on these globs: Playwright's sync API serves
+# route handlers only while the worker thread is inside a Playwright call, so
+# a catch-all route would stall every request during our sleeps.
+_BLOCKED_RESOURCE_TYPES = frozenset({"image", "media", "font"})
+_STATIC_ASSET_URL_PATTERNS = (
+    "**/*.{png,jpg,jpeg,gif,webp,svg,ico,woff,woff2,ttf,otf,mp4,webm}*",
+    "**/avatars.githubusercontent.com/**",
+)
+_TELEMETRY_URL_PATTERNS = (
+    "**/collector.github.com/**",
+    "**/www.google-analytics.com/**",
+    "**/api.github.com/_private/browser/**",
+)
+
+_DASHBOARD_SELECTOR = "header[role='banner']"
+_SKIP_BUTTON_SELECTOR = (
+    "button:has-text('skip 2FA verification'), button:has-text('Skip for now')"
+)
+_LOGIN_DONE_SELECTOR = f"{_DASHBOARD_SELECTOR}, {_SKIP_BUTTON_SELECTOR}"
+_SUBMIT_SELECTOR = (
+    'dialog#rename-form-dialog button.Button--primary.Button--medium.Button[type="submit"], '
+    'dialog#rename-form-dialog button:has-text("Change my username")'
+)
+_ENABLED_SUBMIT_SELECTOR = (
+    'dialog#rename-form-dialog button[type="submit"]:not([disabled]):not([aria-disabled="true"])'
+)
+_ERROR_ICON_SELECTOR = (
+    "dialog#rename-form-dialog .FormControl-inlineValidation "
+    "[data-target=\"primer-text-field.validationErrorIcon\"]:not([hidden])"
+)
+_SUCCESS_ICON_SELECTOR = (
+    "dialog#rename-form-dialog .FormControl-inlineValidation "
+    "[data-target='primer-text-field.validationSuccessIcon']:not([hidden])"
+)
+_FLASH_ERROR_SELECTOR = ".flash-error"
+_AUTO_CHECK_SELECTOR = "dialog#rename-form-dialog auto-check:has(input#login)"
+_AVAILABILITY_URL_PARTS = ("login_field_check", "rename_check")
+_TWO_FACTOR_URL_RE = re.compile(r"/sessions/two-factor/app")
+_RENAME_URL_RE = re.compile(r"/rename(?:$|\?)")
 
 
 @dataclass(frozen=True)
@@ -31,15 +89,20 @@ class ProxySettings:
     def parse(cls, proxy_string: str) -> "ProxySettings":
         """Parse a ``host:port:user:pass`` proxy string."""
 
-        parts = proxy_string.split(":", 3)
-        if len(parts) != 4:
-            raise ValueError("Proxy phải có dạng host:port:user:pass")
-        host, port, username, password = parts
-        try:
-            port_int = int(port)
-        except ValueError as exc:  # pragma: no cover - defensive guard
-            raise ValueError("Port của proxy phải là số") from exc
-        return cls(host=host, port=port_int, username=username, password=password)
+        return _parse_proxy(cls, proxy_string)
+
+
+@functools.lru_cache(maxsize=32)
+def _parse_proxy(cls: type[ProxySettings], proxy_string: str) -> ProxySettings:
+    parts = proxy_string.split(":", 3)
+    if len(parts) != 4:
+        raise ValueError("Proxy phải có dạng host:port:user:pass")
+    host, port, username, password = parts
+    try:
+        port_int = int(port)
+    except ValueError as exc:  # pragma: no cover - defensive guard
+        raise ValueError("Port của proxy phải là số") from exc
+    return cls(host=host, port=port_int, username=username, password=password)
 
 
 @dataclass(frozen=True)
@@ -55,31 +118,267 @@ class AccountInfo:
     def parse(cls, account_string: str) -> "AccountInfo":
         """Parse a ``new|current|password|2fa`` account string."""
 
-        parts = [part.strip() for part in account_string.split("|", 3)]
-        if len(parts) != 4 or any(not part for part in parts):
-            raise ValueError(
-                "Sai định dạng. Yêu cầu: newusername|currentusername|password|2fa_secret"
-            )
-        return cls(
-            new_username=parts[0],
-            current_username=parts[1],
-            password=parts[2],
-            totp_secret=parts[3],
+        return _parse_account(cls, account_string)
+
+
+@functools.lru_cache(maxsize=128)
+def _parse_account(cls: type[AccountInfo], account_string: str) -> AccountInfo:
+    parts = [part.strip() for part in account_string.split("|", 3)]
+    if len(parts) != 4 or any(not part for part in parts):
+        raise ValueError(
+            "Sai định dạng. Yêu cầu: newusername|currentusername|password|2fa_secret"
+        )
+    return cls(
+        new_username=parts[0],
+        current_username=parts[1],
+        password=parts[2],
+        totp_secret=parts[3],
+    )
+
+
+def clear_parse_caches() -> None:
+    """Drop memoized parse results so credentials do not outlive a batch."""
+
+    _parse_proxy.cache_clear()
+    _parse_account.cache_clear()
+
+
+def _write_private(path: Path, data: bytes) -> None:
+    """Write ``data`` to ``path`` readable only by the current user.
+
+    Saved sessions hold GitHub cookies that bypass both password and 2FA, so
+    the file is created 0600 inside 0700 directories.
+    """
+
+    for directory in (path.parent.parent, path.parent):
+        directory.mkdir(mode=0o700, exist_ok=True)
+        os.chmod(directory, 0o700)
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    with os.fdopen(fd, "wb") as handle:
+        handle.write(data)
+    os.chmod(path, 0o600)
+
+
+def _describe_error(exc: Exception) -> str:
+    """Translate an automation failure into the message shown in the GUI.
+
+    Never imports anything itself: the failure may be that Playwright or
+    GoLogin could not be imported in the first place.
+    """
+
+    if isinstance(exc, ImportError):
+        return (
+            f"THIẾU THƯ VIỆN: không import được {exc.name or exc}.\n- Cài lại bằng: pip install ."
         )
+    if isinstance(exc, JSONDecodeError):
+        return (
+            "LỖI GIAO TIẾP GOLOGIN:\n- API Token không hợp lệ/hết hạn.\n- Mạng/Proxy chặn kết nối."
+        )
+    playwright_api = sys.modules.get("playwright.sync_api")
+    if playwright_api is not None and isinstance(exc, playwright_api.TimeoutError):
+        return (
+            "LỖI TIMEOUT: Trang/phần tử không tải kịp.\n- Kiểm tra kết nối/proxy.\n- Có thể giao diện GitHub đã thay đổi."
+        )
+    if isinstance(exc, ValueError):
+        return str(exc)
+    return f"ĐÃ GẶP LỖI:\n{exc}"
+
+
+def _block_heavy_resources(route: Route) -> None:
+    """Abort static assets the automation never looks at (media, fonts)."""
+
+    if route.request.resource_type in _BLOCKED_RESOURCE_TYPES:
+        route.abort()
+    else:
+        route.continue_()
+
+
+def _block_telemetry(route: Route) -> None:
+    """Abort analytics beacons."""
+
+    route.abort()
+
+
+def _is_rename_response(response: Response) -> bool:
+    """Match the POST that submits the rename form (not its live checks)."""
+
+    return response.request.method == "POST" and bool(_RENAME_URL_RE.search(response.url))
+
+
+def _is_auto_check_response(check_path: str, response: Response) -> bool:
+    """Match the request the rename form's ``<auto-check>`` sends to ``check_path``."""
+
+    return urlsplit(response.url).path == check_path
+
+
+def _is_availability_response(response: Response) -> bool:
+    """Match the live username availability check issued by the rename form."""
+
+    return any(part in response.url for part in _AVAILABILITY_URL_PARTS)
+
+
+class BrowserStartupError(RuntimeError):
+    """Raised to workers when the shared browser of their batch failed to start."""
+
 
+class BrowserSession(QObject):
+    """Own one GoLogin profile shared by every worker of a batch.
 
-class AutomationWorker(QObject):
-    """Execute the GitHub username change flow using Playwright."""
+    :meth:`start` creates and launches the profile on a background thread so
+    that GoLogin's slow startup overlaps with the workers spinning up their
+    Playwright drivers. Each worker then opens its own Playwright connection
+    to the same browser over CDP, since Playwright's sync objects cannot be
+    shared between threads.
+
+    When ``debugger_address`` is given the session attaches to that already
+    running browser instead, and no GoLogin profile is created.
+
+    A startup failure is reported once through ``error``; workers waiting on
+    the session then get a :class:`BrowserStartupError`.
+    """
 
     progress = pyqtSignal(str)
-    finished = pyqtSignal(str)
     error = pyqtSignal(str)
 
-    def __init__(self, token: str, proxy: str, account: str) -> None:
+    def __init__(
+        self,
+        token: str,
+        proxy: ProxySettings | None,
+        profile_name: str,
+        debugger_address: str | None = None,
+    ) -> None:
         super().__init__()
         self._token = token
-        self._proxy_string = proxy
-        self._account_string = account
+        self._proxy = proxy
+        self._profile_name = profile_name
+        self._lock = QMutex()
+        self._startup: Future[str] | None = None
+        self._runner: GoLogin | None = None
+        self.profile_id: str | None = None
+        if debugger_address is not None:
+            self._startup = Future()
+            self._startup.set_result(debugger_address)
+
+    def _start_profile(self) -> str:
+        """Create the GoLogin profile, start it and return its debugger address."""
+
+        from gologin import GoLogin
+
+        if self._proxy is None:
+            raise ValueError("Cần proxy để tạo profile Gologin.")
+        gl_creator = GoLogin({"token": self._token})
+        self.progress.emit("Đang tạo profile Gologin...")
+        self.profile_id = gl_creator.create(
+            {
+                "name": self._profile_name,
+                "os": "win",
+                "proxyEnabled": True,
+                "proxy": {
+                    "mode": "socks5",
+                    "host": self._proxy.host,
+                    "port": self._proxy.port,
+                    "username": self._proxy.username,
+                    "password": self._proxy.password,
+                },
+            }
+        )
+        self.progress.emit(f"Đã tạo profile ID: {self.profile_id}")
+
+        self._runner = GoLogin({"token": self._token, "profile_id": self.profile_id})
+        debugger_address = self._runner.start()
+        self.progress.emit(f"Trình duyệt Gologin đã sẵn sàng tại {debugger_address}.")
+        return debugger_address
+
+    def _run_startup(self) -> str:
+        try:
+            return self._start_profile()
+        except Exception as exc:
+            self.error.emit(_describe_error(exc))
+            raise
+
+    def _stop_profile(self, startup: Future[str]) -> None:
+        """Wait for startup to settle, then stop the browser and delete the profile."""
+
+        try:
+            startup.exception()
+            if self._runner is not None:
+                self._runner.stop()
+            if self.profile_id is not None:
+                from gologin import GoLogin
+
+                GoLogin({"token": self._token}).delete(self.profile_id)
+        except Exception as exc:
+            self.progress.emit(f"Không thể dừng profile Gologin: {exc}")
+        else:
+            if self.profile_id is not None:
+                self.progress.emit(f"Đã dừng và xoá profile ID: {self.profile_id}")
+
+    def start(self) -> Future[str]:
+        """Launch the profile in the background and return its startup future.
+
+        Only the first call submits work; later calls return the same future.
+        """
+
+        self._lock.lock()
+        try:
+            if self._startup is None:
+                executor = ThreadPoolExecutor(max_workers=1)
+                self._startup = executor.submit(self._run_startup)
+                executor.shutdown(wait=False)
+            return self._startup
+        finally:
+            self._lock.unlock()
+
+    @property
+    def failed(self) -> bool:
+        """Whether the profile was started and its startup raised."""
+
+        startup = self._startup
+        return startup is not None and startup.done() and startup.exception() is not None
+
+    def stop(self) -> None:
+        """Stop the GoLogin browser and delete its profile in the background.
+
+        Does nothing for a session attached to an existing ``debugger_address``.
+        """
+
+        self._lock.lock()
+        try:
+            startup = self._startup
+        finally:
+            self._lock.unlock()
+        if startup is None:
+            return
+        executor = ThreadPoolExecutor(max_workers=1)
+        executor.submit(self._stop_profile, startup)
+        executor.shutdown(wait=False)
+
+    def debugger_address(self) -> str:
+        """Block until the profile is running and return its debugger address."""
+
+        try:
+            return self.start().result()
+        except Exception as exc:
+            raise BrowserStartupError("Không khởi động được trình duyệt Gologin.") from exc
+
+    @contextmanager
+    def connect(self) -> Iterator[Browser]:
+        """Yield a Playwright browser connected to the shared profile."""
+
+        from playwright.sync_api import sync_playwright
+
+        self.start()
+
+        with sync_playwright() as p:
+            yield p.chromium.connect_over_cdp(f"http://{self.debugger_address()}")
+
+
+class AccountJob:
+    """Run the login and rename flow for a single account."""
+
+    def __init__(self, account: AccountInfo, progress: Callable[[str], None]) -> None:
+        self._account = account
+        self._progress = progress
 
     # ------------------------------------------------------------------
     @staticmethod
@@ -90,9 +389,12 @@ class AutomationWorker(QObject):
 
     def _human_like_type(self, locator: Locator, text: str) -> None:
         locator.click()
-        for char in text:
-            locator.type(char, delay=random.uniform(110, 220))
-        self._random_delay(0.6, 1.2)
+        locator.fill(text)
+        self._random_delay(0.2, 0.4)
+
+    def _type_and_blur(self, page: Page, locator: Locator, text: str) -> None:
+        self._human_like_type(locator, text)
+        page.keyboard.press("Tab")
 
     def _human_like_click(self, locator: Locator) -> None:
         locator.scroll_into_view_if_needed()
@@ -100,300 +402,363 @@ class AutomationWorker(QObject):
         self._random_delay(0.6, 1.1)
         locator.click(delay=random.uniform(90, 160))
 
-    def _get_totp_code(self, page: Page, secret_key: str) -> str | None:
-        self.progress.emit(
-            f"Đang lấy mã 2FA qua trình duyệt cho key: ...{secret_key[-4:]}"
-        )
-        api_page = page.context.new_page()
-        api_page.goto(
-            f"https://2fa.live/tok/{secret_key}",
-            wait_until="domcontentloaded",
-            timeout=15_000,
-        )
-        content = api_page.inner_text("body")
-        api_page.close()
-        token = json.loads(content).get("token")
-        if token:
-            self.progress.emit(f"Lấy mã thành công: {token}")
+    def _get_totp_code(self, secret_key: str) -> str:
+        secret = re.sub(r"\s+", "", secret_key).upper()
+        self._progress(f"Đang tính mã 2FA cho key: ...{secret[-4:]}")
+        try:
+            token = pyotp.TOTP(secret).now()
+        except ValueError as exc:
+            raise ValueError(
+                "Mã 2FA (2fa_secret) không hợp lệ: phải là chuỗi base32 (A-Z, 2-7)."
+            ) from exc
+        self._progress("Đã tính mã 2FA.")
         return token
 
     # ------------------------------------------------------------------
-    def run(self) -> None:  # pragma: no cover - executed in QThread
-        profile_id: str | None = None
-        gl_creator: GoLogin | None = None
-        try:
-            proxy_settings = ProxySettings.parse(self._proxy_string)
-            account_info = AccountInfo.parse(self._account_string)
-
-            gl_creator = GoLogin({"token": self._token})
-            self.progress.emit("Đang tạo profile Gologin...")
-            profile_id = gl_creator.create(
-                {
-                    "name": f"Profile-{account_info.current_username}",
-                    "os": "win",
-                    "proxyEnabled": True,
-                    "proxy": {
-                        "mode": "socks5",
-                        "host": proxy_settings.host,
-                        "port": proxy_settings.port,
-                        "username": proxy_settings.username,
-                        "password": proxy_settings.password,
-                    },
-                }
-            )
-            self.progress.emit(f"Đã tạo profile ID: {profile_id}")
+    def run(self, browser: Browser) -> None:
+        """Process the account in its own context of ``browser``."""
 
-            gl_runner = GoLogin({"token": self._token, "profile_id": profile_id})
-            debugger_address = gl_runner.start()
+        context = self._resume_session(browser) or self._new_session(browser)
+        try:
+            self._change_username(context.pages[0], self._account)
+        finally:
+            context.close()
 
-            from playwright.sync_api import sync_playwright  # lazy import
+    @staticmethod
+    def _new_context(browser: Browser, **kwargs) -> BrowserContext:
+        context = browser.new_context(**kwargs)
+        for pattern in _STATIC_ASSET_URL_PATTERNS:
+            context.route(pattern, _block_heavy_resources)
+        for pattern in _TELEMETRY_URL_PATTERNS:
+            context.route(pattern, _block_telemetry)
+        return context
+
+    @property
+    def _state_path(self) -> Path:
+        # The login field also takes emails and arbitrary text; keep the name
+        # to one safe path component so it cannot escape _STATE_DIR.
+        name = re.sub(r"[^\w.@-]", "_", self._account.current_username).lstrip(".")
+        return _STATE_DIR / f"{name or '_'}.json"
+
+    def _resume_session(self, browser: Browser) -> BrowserContext | None:
+        """Reopen the saved session of the account if GitHub still accepts it."""
+
+        if not self._state_path.exists():
+            return None
+        try:
+            storage_state = orjson.loads(self._state_path.read_bytes())
+        except orjson.JSONDecodeError:
+            self._progress("File phiên đăng nhập bị hỏng, đăng nhập lại.")
+            return None
 
-            with sync_playwright() as p:
-                browser = p.chromium.connect_over_cdp(f"http://{debugger_address}")
-                context = browser.contexts[0]
-                page = context.pages[0]
+        self._progress("Dùng lại phiên đăng nhập đã lưu...")
+        context = self._new_context(browser, storage_state=storage_state)
+        try:
+            page = context.new_page()
+            page.goto(_SETTINGS_ADMIN_URL, wait_until="domcontentloaded", timeout=35_000)
+            resumed = (
+                page.url.startswith(_SETTINGS_ADMIN_URL)
+                and page.locator(_DASHBOARD_SELECTOR).is_visible()
+            )
+        except BaseException:
+            context.close()
+            raise
 
-                self._login(page, account_info)
-                self._change_username(page, account_info)
+        if resumed:
+            self._progress("Phiên đăng nhập còn hiệu lực, bỏ qua bước đăng nhập.")
+            return context
+        self._progress("Phiên đăng nhập đã hết hạn, đăng nhập lại.")
+        context.close()
+        return None
 
-                self.finished.emit(
-                    f"ĐÃ ĐỔI THÀNH CÔNG USERNAME -> {account_info.new_username}"
-                )
+    def _new_session(self, browser: Browser) -> BrowserContext:
+        """Log in from scratch and save the resulting session for later runs."""
 
-        except ValueError as exc:
-            self.error.emit(str(exc))
-        except JSONDecodeError:
-            self.error.emit(
-                "LỖI GIAO TIẾP GOLOGIN:\n- API Token không hợp lệ/hết hạn.\n- Mạng/Proxy chặn kết nối."
-            )
-        except TimeoutError:
-            self.error.emit(
-                "LỖI TIMEOUT: Trang/phần tử không tải kịp.\n- Kiểm tra kết nối/proxy.\n- Có thể giao diện GitHub đã thay đổi."
-            )
-        except Exception as exc:  # pragma: no cover - defensive guard
-            self.error.emit(f"ĐÃ GẶP LỖI:\n{exc}")
-        finally:
-            if profile_id and gl_creator:
-                self.progress.emit("Kết thúc tiến trình.")
+        context = self._new_context(browser)
+        try:
+            self._login(context.new_page(), self._account)
+            _write_private(self._state_path, orjson.dumps(context.storage_state()))
+        except BaseException:
+            context.close()
+            raise
+        self._progress("Đã lưu phiên đăng nhập.")
+        return context
 
     # ------------------------------------------------------------------
     def _login(self, page: Page, account_info: AccountInfo) -> None:
         page.goto("https://github.com/login", wait_until="domcontentloaded", timeout=35_000)
-        page.wait_for_load_state("networkidle", timeout=35_000)
         self._random_delay()
 
-        self.progress.emit("Gõ username hiện tại...")
+        self._progress("Gõ username hiện tại...")
         self._human_like_type(
             page.get_by_label("Username or email address"), account_info.current_username
         )
 
-        self.progress.emit("Gõ password...")
+        self._progress("Gõ password...")
         self._human_like_type(page.get_by_label("Password"), account_info.password)
 
-        self.progress.emit("Nhấn Sign in...")
-        self._human_like_click(page.get_by_role("button", name="Sign in", exact=True))
+        self._progress("Nhấn Sign in...")
+        with page.expect_navigation(url=_TWO_FACTOR_URL_RE, timeout=35_000):
+            self._human_like_click(page.get_by_role("button", name="Sign in", exact=True))
 
-        page.wait_for_url("**/sessions/two-factor/app**", timeout=35_000)
-        self.progress.emit("Tới trang nhập mã 2FA.")
-        totp_code = self._get_totp_code(page, account_info.totp_secret)
-        if not totp_code:
-            raise RuntimeError("Không thể lấy mã 2FA.")
+        self._progress("Tới trang nhập mã 2FA.")
+        totp_code = self._get_totp_code(account_info.totp_secret)
 
-        self.progress.emit("Gõ mã 2FA...")
+        self._progress("Gõ mã 2FA...")
         self._human_like_type(page.get_by_placeholder("XXXXXX"), totp_code)
 
-        dashboard_selector = "header[role='banner']"
-        skip_button_selector = (
-            "button:has-text('skip 2FA verification'), button:has-text('Skip for now')"
-        )
-        self.progress.emit("Chờ xác nhận đăng nhập...")
-        page.wait_for_selector(f"{dashboard_selector}, {skip_button_selector}", timeout=35_000)
-        skip_button = page.locator(skip_button_selector)
+        self._progress("Chờ xác nhận đăng nhập...")
+        page.wait_for_selector(_LOGIN_DONE_SELECTOR, timeout=35_000)
+        skip_button = page.locator(_SKIP_BUTTON_SELECTOR)
         if skip_button.is_visible():
-            self.progress.emit("Thấy màn hình xác minh thiết bị: nhấn Skip.")
+            self._progress("Thấy màn hình xác minh thiết bị: nhấn Skip.")
             self._human_like_click(skip_button)
         else:
-            self.progress.emit("Đăng nhập thành công.")
+            self._progress("Đăng nhập thành công.")
 
         self._random_delay(2.2, 4.2)
 
     # ------------------------------------------------------------------
     def _change_username(self, page: Page, account_info: AccountInfo) -> None:
-        self.progress.emit("Mở trang quản trị đổi username...")
-        page.goto("https://github.com/settings/admin", wait_until="domcontentloaded", timeout=35_000)
-        page.wait_for_load_state("networkidle", timeout=35_000)
+        if page.url != _SETTINGS_ADMIN_URL:
+            self._progress("Mở trang quản trị đổi username...")
+            page.goto(_SETTINGS_ADMIN_URL, wait_until="domcontentloaded", timeout=35_000)
+
+        # <turbo-frame> is a custom element in the main document, not an
+        # <iframe>, so it is scoped with a plain locator. Only the "Change
+        # username" button lives inside it; the warning and form dialogs are
+        # rendered at the top level and are queried from ``page`` directly.
+        settings_frame = page.locator("turbo-frame#settings-frame")
+        change_button = settings_frame.locator("button#dialog-show-rename-warning-dialog")
+        change_button.wait_for(state="visible", timeout=30_000)
         self._random_delay()
 
-        frame = page.frame_locator("turbo-frame#settings-frame")
-
-        self.progress.emit('Bấm "Change username" (robust)...')
-        change_button = frame.locator("button#dialog-show-rename-warning-dialog")
-        change_button.wait_for(state="visible", timeout=30_000)
+        self._progress('Bấm "Change username" (robust)...')
         page.evaluate("window.scrollTo(0, 0)")
         change_button.scroll_into_view_if_needed()
 
-        page.wait_for_function(
-            """
-            (selector) => {
-                const el = document.querySelector('turbo-frame#settings-frame')?.querySelector(selector);
-                if (!el) return false;
-                const rect = el.getBoundingClientRect();
-                const inView = rect.width > 0 && rect.height > 0 && rect.top >= 0 && rect.left >= 0;
-                const disabled = el.disabled || el.getAttribute('aria-disabled') === 'true';
-                return inView && !disabled;
-            }
-            """,
-            arg="button#dialog-show-rename-warning-dialog",
-            timeout=10_000,
-        )
-
-        self._retry_click(page, change_button, "Change username", max_attempts=5)
+        self._retry_click(change_button, "Change username")
 
-        self.progress.emit("Chờ dialog cảnh báo mở...")
+        self._progress("Chờ dialog cảnh báo mở...")
         page.wait_for_function(
             "document.getElementById('rename-warning-dialog')?.open === true",
             timeout=12_000,
         )
         self._random_delay(0.8, 1.4)
 
-        self.progress.emit('Bấm "I understand, let’s change my username"...')
+        self._progress('Bấm "I understand, let’s change my username"...')
         understand_button = page.locator(
             "dialog#rename-warning-dialog button[data-show-dialog-id='rename-form-dialog']"
         )
         understand_button.wait_for(state="visible", timeout=15_000)
         understand_button.scroll_into_view_if_needed()
-        self._retry_click(
-            page, understand_button, "I understand, let’s change my username", max_attempts=4
-        )
+        self._retry_click(understand_button, "I understand, let’s change my username")
 
-        self.progress.emit("Chờ form đổi username mở...")
+        self._progress("Chờ form đổi username mở...")
         page.wait_for_function(
             "document.getElementById('rename-form-dialog')?.open === true",
             timeout=12_000,
         )
         self._random_delay(0.8, 1.4)
 
-        self.progress.emit("Nhập username mới...")
+        self._progress("Nhập username mới...")
         username_input = page.locator("dialog#rename-form-dialog input#login")
         username_input.wait_for(state="visible", timeout=15_000)
         username_input.scroll_into_view_if_needed()
-        username_input.fill("")
-        self._human_like_type(username_input, account_info.new_username)
-
-        page.keyboard.press("Tab")
-        time.sleep(0.8)
 
-        submit_button = page.locator(
-            'dialog#rename-form-dialog button.Button--primary.Button--medium.Button[type="submit"], '
-            'dialog#rename-form-dialog button:has-text("Change my username")'
+        # Arm a single wait for GitHub's availability check before typing: it
+        # may fire on input or on blur, and its response is only read once.
+        available = self._check_availability(
+            page, lambda: self._type_and_blur(page, username_input, account_info.new_username)
         )
+        if available is False:
+            raise RuntimeError("GitHub báo lỗi: username không khả dụng hoặc không hợp lệ.")
+
+        submit_button = page.locator(_SUBMIT_SELECTOR)
         submit_button.first.wait_for(state="visible", timeout=15_000)
         submit_button.first.scroll_into_view_if_needed()
 
-        self.progress.emit('Bấm "Change my username" lần 1 (kích hoạt check)...')
-        try:
-            submit_button.first.click(delay=random.uniform(90, 160))
-        except Exception:
-            element = submit_button.first.element_handle()
-            if element is not None:
-                page.evaluate("(el) => el.click()", element)
-
-        if not self._wait_availability(page):
-            error_icon = page.locator(
-                "dialog#rename-form-dialog .FormControl-inlineValidation [data-target=\"primer-text-field.validationErrorIcon\"]:not([hidden])"
-            )
-            if error_icon.count() > 0 and error_icon.is_visible():
-                raise RuntimeError("GitHub báo lỗi: username không khả dụng hoặc không hợp lệ.")
-            raise RuntimeError("Không thấy xác nhận khả dụng (icon success hoặc 'is available').")
-
-        self._random_delay(1.0, 1.8)
+        if available is None:
+            # No answer from the live check: the first click triggers it and
+            # the second one, below, submits once the form turns green.
+            self._progress('Bấm "Change my username" lần 1 (kích hoạt check)...')
+            self._click_or_dispatch(submit_button.first)
+            if not self._wait_availability(page):
+                error_icon = page.locator(_ERROR_ICON_SELECTOR)
+                if error_icon.count() > 0 and error_icon.is_visible():
+                    raise RuntimeError(
+                        "GitHub báo lỗi: username không khả dụng hoặc không hợp lệ."
+                    )
+                raise RuntimeError(
+                    "Không thấy xác nhận khả dụng (icon success hoặc 'is available')."
+                )
+            self._random_delay(1.0, 1.8)
+        else:
+            self._progress("GitHub xác nhận username khả dụng.")
 
-        self.progress.emit('Bấm "Change my username" lần 2 để xác nhận...')
-        enabled_button = page.locator(
-            'dialog#rename-form-dialog button[type="submit"]:not([disabled]):not([aria-disabled="true"])'
-        )
+        self._progress('Bấm "Change my username" để xác nhận...')
+        enabled_button = page.locator(_ENABLED_SUBMIT_SELECTOR)
         target_button = enabled_button.first if enabled_button.count() > 0 else submit_button.first
         target_button.scroll_into_view_if_needed()
+
+        from playwright.sync_api import TimeoutError as PlaywrightTimeoutError
+        from playwright.sync_api import expect
+
+        self._progress("Chờ xác nhận đổi username thành công...")
         try:
-            target_button.click(delay=random.uniform(90, 160))
-        except Exception:
-            element = target_button.element_handle()
-            if element is not None:
-                page.evaluate("(el) => el.click()", element)
+            with page.expect_response(_is_rename_response, timeout=35_000) as response_info:
+                self._click_or_dispatch(target_button)
+            response = response_info.value
+        except PlaywrightTimeoutError:
+            self._progress("Không bắt được phản hồi đổi username, kiểm tra giao diện...")
+        else:
+            if response.status >= 400:
+                raise RuntimeError(f"GitHub từ chối đổi username (HTTP {response.status}).")
+            # A rejected rename also comes back as a redirect or a re-rendered
+            # form, so the response only ends the wait; the page decides.
+            self._progress(
+                f"GitHub đã nhận yêu cầu đổi username (HTTP {response.status}), kiểm tra kết quả..."
+            )
 
-        self.progress.emit("Chờ xác nhận đổi username thành công...")
-        page.wait_for_load_state("networkidle", timeout=35_000)
         success_banner = page.locator("text=Your username has been changed")
-        new_profile_hint = page.locator(
-            f"a[href='/{account_info.new_username}'], text={account_info.new_username}"
+        new_profile_hint = page.locator(f"a[href='/{account_info.new_username}']").or_(
+            page.get_by_text(account_info.new_username)
         )
-        if success_banner.count() == 0 and new_profile_hint.count() == 0:
+        flash_error = page.locator(_FLASH_ERROR_SELECTOR)
+        try:
+            expect(
+                success_banner.or_(new_profile_hint).or_(flash_error).first
+            ).to_be_visible(timeout=35_000)
+        except AssertionError:
             dialog_open = page.locator("dialog#rename-form-dialog[open]")
-            error_icon = page.locator(
-                "dialog#rename-form-dialog .FormControl-inlineValidation [data-target=\"primer-text-field.validationErrorIcon\"]:not([hidden])"
-            )
+            error_icon = page.locator(_ERROR_ICON_SELECTOR)
             if dialog_open.count() > 0 and error_icon.count() > 0 and error_icon.is_visible():
                 raise RuntimeError("GitHub báo lỗi khi đổi username (validation error).")
-            self.progress.emit(
+            self._progress(
                 "Không thấy banner, nhưng không có lỗi hiển thị. Có thể đã đổi xong."
             )
+        else:
+            if flash_error.first.is_visible():
+                raise RuntimeError(
+                    f"GitHub từ chối đổi username: {flash_error.first.inner_text().strip()}"
+                )
 
     # ------------------------------------------------------------------
+    def _check_availability(self, page: Page, action: Callable[[], None]) -> bool | None:
+        """Run ``action`` and read the availability check it triggers.
+
+        The check is matched on the ``src`` of the form's ``<auto-check>``
+        element. Without one, known endpoint names are tried with a timeout
+        close to the fixed pause this replaced, so a miss costs little.
+
+        Returns ``False`` for a 422 answer, the ``available`` flag of a JSON
+        answer, ``True`` for any other successful ``<auto-check>`` answer, and
+        ``None`` when nothing usable arrives. Errors raised by ``action``
+        itself propagate unchanged.
+        """
+
+        from playwright.sync_api import Error as PlaywrightError
+
+        auto_check = page.locator(_AUTO_CHECK_SELECTOR)
+        src = auto_check.first.get_attribute("src") if auto_check.count() > 0 else None
+        if src:
+            matches = functools.partial(_is_auto_check_response, urlsplit(src).path)
+            timeout = 5_000
+        else:
+            matches, timeout = _is_availability_response, 1_500
+
+        acted = False
+        try:
+            with page.expect_response(matches, timeout=timeout) as response_info:
+                action()
+                acted = True
+            response = response_info.value
+        except PlaywrightError:
+            if not acted:
+                raise
+            return None
+        if response.status == 422:
+            return False
+        try:
+            payload = response.json()
+        except (PlaywrightError, ValueError):
+            return True if src and response.ok else None
+        available = payload.get("available") if isinstance(payload, dict) else None
+        return available if isinstance(available, bool) else None
+
     def _wait_availability(self, page: Page, timeout_seconds: float = 35.0) -> bool:
-        self.progress.emit("Chờ xác nhận khả dụng (icon xanh hoặc \"is available\")...")
-        success_icon = page.locator(
-            "dialog#rename-form-dialog .FormControl-inlineValidation "
-            "[data-target='primer-text-field.validationSuccessIcon']:not([hidden])"
-        )
+        from playwright.sync_api import expect
+
+        self._progress("Chờ xác nhận khả dụng (icon xanh hoặc \"is available\")...")
+        success_icon = page.locator(_SUCCESS_ICON_SELECTOR)
         success_text = page.locator("dialog#rename-form-dialog >> text=is available")
-        deadline = time.time() + timeout_seconds
-        while time.time() < deadline:
-            try:
-                if success_icon.count() > 0 and success_icon.is_visible():
-                    return True
-            except Exception:  # pragma: no cover - locator transient errors
-                pass
-            try:
-                if success_text.count() > 0 and success_text.is_visible():
-                    return True
-            except Exception:  # pragma: no cover
-                pass
-            time.sleep(0.6)
-        return False
-
-    def _retry_click(
-        self, page: Page, locator: Locator, name: str, max_attempts: int = 5
-    ) -> None:
-        clicked = False
-        for attempt in range(1, max_attempts + 1):
+        try:
+            expect(success_icon.or_(success_text).first).to_be_visible(
+                timeout=int(timeout_seconds * 1000)
+            )
+        except AssertionError:
+            return False
+        return True
+
+    @staticmethod
+    def _click_or_dispatch(locator: Locator) -> None:
+        try:
+            locator.click(delay=random.uniform(90, 160))
+        except Exception:
+            locator.dispatch_event("click")
+
+    def _retry_click(self, locator: Locator, name: str) -> None:
+        attempts: list[Callable[[], None]] = [
+            lambda: locator.click(),
+            lambda: locator.click(force=True),
+            lambda: locator.dispatch_event("click"),
+            lambda: locator.click(force=True, no_wait_after=True),
+        ]
+        for attempt, click in enumerate(attempts, start=1):
             try:
-                if attempt == 1:
-                    locator.click()
-                elif attempt == 2:
-                    locator.click(force=True)
-                elif attempt == 3:
-                    element = locator.element_handle()
-                    if not element:
-                        raise RuntimeError("Không tìm thấy phần tử để click.")
-                    box = element.bounding_box()
-                    if not box:
-                        raise RuntimeError("Không lấy được bounding box của phần tử.")
-                    page.mouse.move(box["x"] + box["width"] / 2, box["y"] + box["height"] / 2)
-                    time.sleep(random.uniform(0.18, 0.32))
-                    page.mouse.down()
-                    time.sleep(random.uniform(0.06, 0.12))
-                    page.mouse.up()
-                elif attempt == max_attempts:
-                    locator.click(force=True)
-                else:
-                    element = locator.element_handle()
-                    if element is None:
-                        raise RuntimeError("Không tìm thấy phần tử để click.")
-                    page.evaluate("(el)=>el.click()", element)
-                clicked = True
-                break
+                click()
+                return
             except Exception as exc:
-                self.progress.emit(f'Thử click "{name}" lần {attempt} lỗi: {exc}')
+                self._progress(f'Thử click "{name}" lần {attempt} lỗi: {exc}')
                 time.sleep(0.5)
-        if not clicked:
-            raise RuntimeError(f'Không thể click "{name}" sau nhiều lần thử.')
+        raise RuntimeError(f'Không thể click "{name}" sau nhiều lần thử.')
+
+
+class WorkerSignals(QObject):
+    """Signals emitted by :class:`AutomationWorker` from the thread pool.
+
+    ``error`` carries the failed :class:`AccountInfo` alongside the message so
+    the GUI can re-queue just that account. The message is empty when the
+    shared browser failed to start, which :class:`BrowserSession` reports once.
+    """
+
+    progress = pyqtSignal(str)
+    finished = pyqtSignal(str)
+    error = pyqtSignal(object, str)
+
+
+class AutomationWorker(QRunnable):
+    """Execute the GitHub username change flow for one account of a batch."""
+
+    def __init__(self, session: BrowserSession, account: AccountInfo) -> None:
+        super().__init__()
+        self.signals = WorkerSignals()
+        self._session = session
+        self._account = account
+
+    def _emit_progress(self, message: str) -> None:
+        self.signals.progress.emit(f"[{self._account.current_username}] {message}")
+
+    # ------------------------------------------------------------------
+    def run(self) -> None:  # pragma: no cover - executed in QThreadPool
+        try:
+            with self._session.connect() as browser:
+                AccountJob(self._account, self._emit_progress).run(browser)
+        except BrowserStartupError:
+            self.signals.error.emit(self._account, "")
+        except Exception as exc:
+            self.signals.error.emit(
+                self._account, f"- {self._account.current_username}: {_describe_error(exc)}"
+            )
+        else:
+            self.signals.finished.emit(self._account.new_username)
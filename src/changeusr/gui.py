@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from PyQt5.QtCore import QThread
+from PyQt5.QtCore import QThreadPool
 from PyQt5.QtWidgets import (
     QApplication,
     QFormLayout,
@@ -14,7 +14,14 @@ from PyQt5.QtWidgets import (
     QWidget,
 )
 
-from .automation import AutomationWorker
+from .automation import (
+    MAX_CONCURRENT_JOBS,
+    AccountInfo,
+    AutomationWorker,
+    BrowserSession,
+    ProxySettings,
+    clear_parse_caches,
+)
 
 
 class MainWindow(QWidget):
@@ -25,8 +32,13 @@ class MainWindow(QWidget):
         self.setWindowTitle("GitHub Username Changer")
         self.setGeometry(100, 100, 700, 680)
 
-        self._thread: QThread | None = None
-        self._worker: AutomationWorker | None = None
+        self._pool = QThreadPool.globalInstance()
+        self._pool.setMaxThreadCount(MAX_CONCURRENT_JOBS)
+        self._workers: list[AutomationWorker] = []
+        self._session: BrowserSession | None = None
+        self._pending = 0
+        self._renamed: list[str] = []
+        self._failures: list[AccountInfo] = []
 
         self._setup_ui()
 
@@ -41,11 +53,20 @@ class MainWindow(QWidget):
         self.proxy_input = QLineEdit()
         self.proxy_input.setPlaceholderText("host:port:user:pass")
 
-        self.account_input = QLineEdit()
-        self.account_input.setPlaceholderText("newusername|currentusername|password|2fa_secret")
+        self.endpoint_input = QLineEdit()
+        self.endpoint_input.setPlaceholderText(
+            "Tuỳ chọn: host:port của trình duyệt đang chạy (bỏ qua tạo profile)"
+        )
+
+        self.account_input = QPlainTextEdit()
+        self.account_input.setPlaceholderText(
+            "Mỗi dòng một tài khoản: newusername|currentusername|password|2fa_secret"
+        )
+        self.account_input.setMaximumHeight(120)
 
         form_layout.addRow(QLabel("Gologin API Token:"), self.token_input)
         form_layout.addRow(QLabel("Proxy (SOCKS5):"), self.proxy_input)
+        form_layout.addRow(QLabel("CDP endpoint:"), self.endpoint_input)
         form_layout.addRow(QLabel("Thông tin tài khoản:"), self.account_input)
 
         self.run_button = QPushButton("Bắt đầu đổi Username")
@@ -75,63 +96,146 @@ class MainWindow(QWidget):
 
     # ------------------------------------------------------------------
     def start_automation(self) -> None:
-        token = self.token_input.text().strip()
-        proxy = self.proxy_input.text().strip()
-        account = self.account_input.text().strip()
-
-        if not all([token, proxy, account]):
+        accounts = [
+            line.strip()
+            for line in self.account_input.toPlainText().splitlines()
+            if line.strip()
+        ]
+        if not accounts:
             self.log_output.setPlainText(
-                "Lỗi: Vui lòng điền đủ Token, Proxy và Thông tin tài khoản."
+                "Lỗi: Vui lòng điền đủ Token, Proxy (hoặc CDP endpoint) và Thông tin tài khoản."
             )
             return
 
-        if len(account.split("|")) < 4:
-            self.log_output.setPlainText(
-                "Lỗi: Định dạng phải là newusername|currentusername|password|2fa_secret"
-            )
+        try:
+            account_infos = [AccountInfo.parse(account) for account in accounts]
+        except ValueError as exc:
+            self.log_output.setPlainText(f"Lỗi: {exc}")
             return
 
-        self.run_button.setEnabled(False)
-        self.continue_button.setEnabled(False)
-        self.run_button.setText("Đang chạy...")
         self.log_output.clear()
         self.result_output.clear()
+        self._renamed = []
+        self._start_batch(account_infos)
 
-        self._thread = QThread()
-        self._worker = AutomationWorker(token, proxy, account)
-        self._worker.moveToThread(self._thread)
+    def _new_session(self, account_infos: list[AccountInfo]) -> BrowserSession | None:
+        token = self.token_input.text().strip()
+        proxy = self.proxy_input.text().strip()
+        endpoint = self.endpoint_input.text().strip() or None
 
-        self._thread.started.connect(self._worker.run)  # type: ignore[arg-type]
-        self._worker.progress.connect(self._append_log)
-        self._worker.error.connect(self._handle_error)
-        self._worker.finished.connect(self._handle_finished)
+        if not (endpoint or (token and proxy)):
+            self.log_output.appendPlainText(
+                "Lỗi: Vui lòng điền đủ Token, Proxy (hoặc CDP endpoint) và Thông tin tài khoản."
+            )
+            return None
+
+        try:
+            proxy_settings = None if endpoint else ProxySettings.parse(proxy)
+        except ValueError as exc:
+            self.log_output.appendPlainText(f"Lỗi: {exc}")
+            return None
+
+        self._stop_session()
+        session = BrowserSession(
+            token,
+            proxy_settings,
+            f"Profile-{account_infos[0].current_username}",
+            debugger_address=endpoint,
+        )
+        if endpoint:
+            self.log_output.appendPlainText(f"Dùng trình duyệt có sẵn tại {endpoint}.")
+        session.progress.connect(self._append_log)
+        session.error.connect(self._handle_session_error)
+        self._session = session
+        return session
+
+    def _stop_session(self) -> None:
+        if self._session is not None:
+            self._session.stop()
+            self._session = None
+
+    def _start_batch(
+        self, account_infos: list[AccountInfo], session: BrowserSession | None = None
+    ) -> None:
+        if session is None:
+            session = self._new_session(account_infos)
+            if session is None:
+                return
 
-        self._thread.finished.connect(self._thread.deleteLater)
-        self._worker.finished.connect(self._thread.quit)
-        self._worker.error.connect(self._thread.quit)
+        self.run_button.setEnabled(False)
+        self.continue_button.setEnabled(False)
+        self.run_button.setText("Đang chạy...")
 
-        self._thread.start()
+        session.start()
+        # Keep references so the signal objects outlive the pooled runnables.
+        self._workers = [AutomationWorker(session, account) for account in account_infos]
+        self._pending = len(self._workers)
+        self._failures = []
+        for worker in self._workers:
+            worker.signals.progress.connect(self._append_log)
+            worker.signals.error.connect(self._handle_error)
+            worker.signals.finished.connect(self._handle_finished)
+            self._pool.start(worker)
 
     # ------------------------------------------------------------------
     def _rerun(self) -> None:
-        self.log_output.appendPlainText("\n--- Tiếp tục thao tác (chạy lại) ---")
-        self.start_automation()
+        if not self._failures:
+            self.start_automation()
+            return
+        self.log_output.appendPlainText(
+            f"\n--- Tiếp tục thao tác (chạy lại {len(self._failures)} tài khoản lỗi) ---"
+        )
+        # Retry on the batch's browser; only start a new one if it never came up.
+        session = self._session
+        if session is not None and session.failed:
+            session = None
+        self._start_batch(list(self._failures), session)
 
     def _append_log(self, message: str) -> None:
         self.log_output.appendPlainText(message)
 
-    def _handle_error(self, message: str) -> None:
+    def _handle_session_error(self, message: str) -> None:
         self.log_output.appendPlainText(f"\n--- LỖI ---\n{message}\n-----------")
-        self.run_button.setEnabled(True)
-        self.run_button.setText("Chạy lại")
-        self.continue_button.setEnabled(True)
-
-    def _handle_finished(self, message: str) -> None:
-        self.log_output.appendPlainText("\n--- HOÀN THÀNH ---")
-        self.result_output.setText(message)
-        self.run_button.setEnabled(True)
-        self.run_button.setText("Bắt đầu đổi Username")
-        self.continue_button.setEnabled(False)
+
+    def _handle_error(self, account: AccountInfo, message: str) -> None:
+        if message:
+            self.log_output.appendPlainText(f"\n--- LỖI ---\n{message}\n-----------")
+        self._failures.append(account)
+        self._job_done()
+
+    def _handle_finished(self, new_username: str) -> None:
+        self._renamed.append(new_username)
+        self._job_done()
+
+    def _job_done(self) -> None:
+        self._pending -= 1
+        if self._pending > 0:
+            return
+
+        self.log_output.appendPlainText("Kết thúc tiến trình.")
+        self._workers = []
+        clear_parse_caches()
+        if self._failures:
+            self.log_output.appendPlainText(
+                f"\n--- {len(self._failures)} tài khoản chưa đổi được ---"
+            )
+            self.run_button.setEnabled(True)
+            self.run_button.setText("Chạy lại")
+            self.continue_button.setEnabled(True)
+        else:
+            self._stop_session()
+            self.log_output.appendPlainText("\n--- HOÀN THÀNH ---")
+            self.run_button.setEnabled(True)
+            self.run_button.setText("Bắt đầu đổi Username")
+            self.continue_button.setEnabled(False)
+        if self._renamed:
+            self.result_output.setText(
+                f"ĐÃ ĐỔI THÀNH CÔNG USERNAME -> {', '.join(self._renamed)}"
+            )
+
+    def closeEvent(self, event) -> None:  # noqa: N802 - Qt override
+        self._stop_session()
+        super().closeEvent(event)
 
 
 def run() -> int: